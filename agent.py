@@ -1,33 +1,30 @@
 # Load Lib
 import pandas as pd
-import pdfplumber
 import argparse
-import subprocess
 import sys
+import io
+import contextlib
 import os
+import re
+import json
+import hashlib
+import functools
+import string
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any
-from dotenv import load_dotenv
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
-# Load environment variables from .env file
-dotenv_path = Path(r"D:\07-SANKET\Assignment\.env")
-load_dotenv(dotenv_path=dotenv_path)
+# Environment variables are loaded from this .env file when not already set
+DOTENV_PATH = Path(r"D:\07-SANKET\Assignment\.env")
 
 # LLM
 
-try:
-    import google.generativeai as genai
-    HAS_GEMINI = True
-except ImportError:
-    HAS_GEMINI = False
-
-try:
-    from groq import Groq
-    HAS_GROQ = True
-except ImportError:
-    HAS_GROQ = False
+GEMINI_MODEL = "gemini-1.5-flash"
+LLM_CACHE_PATH = Path.home() / ".cache" / "bank_parser_agent" / "llm_cache.json"
+# Least recently used responses are dropped beyond this many entries
+LLM_CACHE_MAX_ENTRIES = 64
 
 
 @dataclass
@@ -44,36 +41,137 @@ class AgentState:
 
 
 class LLMClient:
-    def __init__(self, provider: str = "gemini"):
+    def __init__(self, provider: str = "gemini", use_cache: bool = True,
+                 cache_path: Path = LLM_CACHE_PATH):
         self.provider = provider
         self.client = None
+        self.use_cache = use_cache
+        self.cache_path = cache_path
+        self._cache = self._load_cache() if use_cache else {}
+        self._prune_cache()
+        self._genai = None
+        self._gemini_models = {}
         self._initialize_client()
 
     def _initialize_client(self):
-        if self.provider == "gemini" and HAS_GEMINI:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY environment variable not set")
+        # Provider SDKs are slow to import, so only the selected one is loaded
+        genai = Groq = None
+        try:
+            if self.provider == "gemini":
+                import google.generativeai as genai
+            elif self.provider == "groq":
+                from groq import Groq
+        except ImportError:
+            pass
+
+        if genai is not None:
+            api_key = self._get_api_key("GOOGLE_API_KEY")
             genai.configure(api_key=api_key)
-            self.client = genai.GenerativeModel("gemini-1.5-flash")
-        elif self.provider == "groq" and HAS_GROQ:
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
-                raise ValueError("GROQ_API_KEY environment variable not set")
+            self._genai = genai
+            self.client = genai.GenerativeModel(GEMINI_MODEL)
+        elif Groq is not None:
+            api_key = self._get_api_key("GROQ_API_KEY")
             self.client = Groq(api_key=api_key)
         else:
             raise ValueError(
                 f"Provider {self.provider} not supported or library not installed"
             )
 
-    def generate(self, prompt: str) -> str:
+    @staticmethod
+    def _get_api_key(name: str) -> str:
+        api_key = os.getenv(name)
+        if not api_key:
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=DOTENV_PATH)
+            api_key = os.getenv(name)
+        if not api_key:
+            raise ValueError(f"{name} environment variable not set")
+        return api_key
+
+    def generate(self, prompt: str, system: Optional[str] = None,
+                 cache: bool = True) -> str:
+        """Returns the model's response, served from the on-disk cache if possible.
+
+        Pass cache=False for prompts that can never repeat (e.g. ones that embed
+        test output with timings), so they don't grow the cache file.
+        """
+        if not (self.use_cache and cache):
+            return self._generate(prompt, system)
+
+        key = self._cache_key(prompt, system)
+        if key in self._cache:
+            # Re-insert so the entry counts as recently used when pruning
+            self._cache[key] = self._cache.pop(key)
+            return self._cache[key]
+
+        response = self._generate(prompt, system)
+        # Failed calls return "" and are retried next time rather than cached
+        if response:
+            self._cache[key] = response
+            self._prune_cache()
+            self._save_cache()
+        return response
+
+    def _prune_cache(self):
+        # Dicts keep insertion order, so the oldest entries come first
+        while len(self._cache) > LLM_CACHE_MAX_ENTRIES:
+            del self._cache[next(iter(self._cache))]
+
+    def evict(self, prompt: str, system: Optional[str] = None):
+        """Drops a cached response, e.g. generated code that failed its test."""
+        if self._cache.pop(self._cache_key(prompt, system), None) is not None:
+            self._save_cache()
+
+    def _cache_key(self, prompt: str, system: Optional[str] = None) -> str:
+        # Normalize cosmetic differences (iteration counter, trailing
+        # whitespace, runs of blank lines) so otherwise identical prompts share
+        # a cache entry. Indentation is kept since prompts embed Python code.
+        normalized = re.sub(r"ITERATION:\s*\d+", "ITERATION:", prompt)
+        normalized = "\n".join(line.rstrip() for line in normalized.splitlines())
+        normalized = re.sub(r"\n{3,}", "\n\n", normalized).strip()
+        payload = f"{self.provider}\0{system or ''}\0{normalized}".encode()
+        return hashlib.blake2b(payload).hexdigest()
+
+    def _load_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f)
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            print(f"LLM cache write error: {e}")
+
+    def _gemini_model(self, system: Optional[str]):
+        # Gemini takes the system prompt at model construction, so keep one
+        # model per distinct system prompt
+        if not system:
+            return self.client
+        if system not in self._gemini_models:
+            self._gemini_models[system] = self._genai.GenerativeModel(
+                GEMINI_MODEL, system_instruction=system)
+        return self._gemini_models[system]
+
+    def _generate(self, prompt: str, system: Optional[str] = None) -> str:
         try:
             if self.provider == "gemini":
-                response = self.client.generate_content(prompt)
+                response = self._gemini_model(system).generate_content(prompt)
                 return response.text
             elif self.provider == "groq":
+                # System message first keeps the static prefix identical
+                # across calls so it can be served from the prefix cache
+                messages = [{"role": "user", "content": prompt}]
+                if system:
+                    messages.insert(0, {"role": "system", "content": system})
                 chat_completion = self.client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
+                    messages=messages,
                     model="llama3-8b-8192",
                     temperature=0.1,
                     max_tokens=4000
@@ -88,39 +186,151 @@ class LLMClient:
 
 class PDFAnalyzer:
     def analyze_pdf(self, pdf_path: str) -> Dict[str, Any]:
+        # The sample PDF does not change across iterations, so reuse the
+        # analysis until the file's mtime or size changes
+        try:
+            stat = os.stat(pdf_path)
+        except OSError as e:
+            return {"error": f"PDF analysis failed: {e}"}
+        return self._analyze(pdf_path, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _analyze(pdf_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
         try:
+            import pdfplumber
             with pdfplumber.open(pdf_path) as pdf:
                 analysis = {
                     "num_pages": len(pdf.pages),
                     "page_samples": [],
-                    "tables_found": [],
+                    "tables_found": 0,
                 }
-                for i, page in enumerate(pdf.pages[:2]):
-                    page_data = {
-                        "page_num": i + 1,
-                        "text": page.extract_text()[:1000] if page.extract_text() else "",
-                        "tables": page.extract_tables(),
-                        "width": page.width,
-                        "height": page.height
-                    }
-                    analysis["page_samples"].append(page_data)
-                    if page_data["tables"]:
-                        analysis["tables_found"].extend(
-                            page_data["tables"][:2])
+                pages = pdf.pages[:2]
+                # The prompt only uses the first page's text, so that is the
+                # only page whose text is extracted
+                if pages:
+                    first_page = pages[0]
+                    # Layout fidelity does not matter for a prompt snippet, so
+                    # use the cheapest text extractor available
+                    if hasattr(first_page, "extract_text_simple"):
+                        text = first_page.extract_text_simple(
+                            x_tolerance=3, y_tolerance=3)
+                    else:
+                        text = first_page.extract_text(
+                            layout=False, x_tolerance=3, y_tolerance=3)
+                    text = text or ""
+                    analysis["page_samples"].append({
+                        "page_num": 1,
+                        "text": text[:1000],
+                        "width": first_page.width,
+                        "height": first_page.height
+                    })
+                # Only the table count reaches the prompt; find_tables detects
+                # tables without extracting their cell text
+                analysis["tables_found"] = sum(
+                    len(page.find_tables()) for page in pages)
                 return analysis
         except Exception as e:
             return {"error": f"PDF analysis failed: {e}"}
 
 # Parser Generator
 
+PARSER_REQUIREMENTS = """You are a Python coding expert. You generate complete, working PDF parsers for bank statements.
+REQUIREMENTS:
+1. Function signature: parse(pdf_path: str) -> pd.DataFrame
+2. Return DataFrame with exactly the columns given for the bank
+3. Handle errors gracefully with try/except
+4. Use pdfplumber as primary library (import pdfplumber)
+5. Include type hints and docstrings
+6. Extract transaction data from the PDF including Debit and Credit columns
+CRITICAL: The returned DataFrame MUST match the expected CSV schema exactly.
+Use pd.DataFrame.equals() for comparison in tests."""
+
+SYSTEM_PROMPT = PARSER_REQUIREMENTS + """
+Generate ONLY the Python code for the parser file. Include all necessary imports.
+Start with imports, then define the parse function."""
+
+BATCH_SYSTEM_PROMPT = PARSER_REQUIREMENTS + """
+You will be given several banks, each under its own ### BANK_N: NAME ### heading.
+Write a separate, self-contained parser file for every bank: start with its imports, then define the parse function.
+Wrap each file in <parser bank="NAME">...</parser> tags, using the bank NAME from its heading, and output nothing outside the tags."""
+
 
 class ParserGenerator:
     def __init__(self, llm_client: LLMClient):
         self.llm = llm_client
+        # Last (prompt, system) sent for each bank, so a failing parser's
+        # cached response can be dropped
+        self._last_requests: Dict[str, Tuple[str, str]] = {}
 
     def generate_parser(self, state: AgentState) -> str:
+        # Static instructions and per-bank context form a stable prefix that
+        # providers can cache; only the tail changes between iterations
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            csv_future, pdf_future = self._submit_inputs(pool, state)
+            tail = (self._build_dynamic_tail(state)
+                    + "\nGenerate the complete working code now:")
+            prompt = self._build_pdf_context(
+                state, csv_future, pdf_future) + tail
+        self._last_requests[state.target_bank.lower()] = (prompt, SYSTEM_PROMPT)
+        generated_code = self.llm.generate(prompt, system=SYSTEM_PROMPT)
+        code = self._extract_python_code(generated_code)
+        return code
+
+    def generate_parsers(self, states: List[AgentState]) -> Dict[str, str]:
+        """Generates parsers for several banks with a single LLM call.
+
+        Returns the parser code keyed by lower-cased bank name. Banks missing
+        from the response are left out.
+        """
+        if len(states) == 1:
+            state = states[0]
+            return {state.target_bank.lower(): self.generate_parser(state)}
+
+        # Sharing one prompt means the instructions are processed once, not per
+        # bank. All static bank contexts come first and all feedback after
+        # them, so the whole context block stays a cacheable prefix.
+        sections = []
+        feedback = []
+        with ThreadPoolExecutor() as pool:
+            inputs = [self._submit_inputs(pool, state) for state in states]
+            for i, (state, (csv_future, pdf_future)) in enumerate(
+                    zip(states, inputs), 1):
+                heading = f"BANK_{i}: {state.target_bank.upper()}"
+                sections.append(f"### {heading} ###\n"
+                                + self._build_pdf_context(
+                                    state, csv_future, pdf_future))
+                tail = self._build_dynamic_tail(state)
+                if tail:
+                    feedback.append(f"### FEEDBACK FOR {heading} ###{tail}")
+        prompt = "\n".join(sections + feedback) + \
+            "\nGenerate the complete working code for every bank now:"
+        system = BATCH_SYSTEM_PROMPT
+        for state in states:
+            self._last_requests[state.target_bank.lower()] = (prompt, system)
+        response = self.llm.generate(prompt, system=system)
+        return {bank.strip().lower(): self._extract_python_code(body)
+                for bank, body in self._extract_parser_blocks(response)}
+
+    def discard_generation(self, state: AgentState):
+        """Keeps a parser that failed its test from being replayed on a rerun."""
+        request = self._last_requests.pop(state.target_bank.lower(), None)
+        if request is not None:
+            self.llm.evict(*request)
+
+    def _submit_inputs(self, pool: ThreadPoolExecutor,
+                       state: AgentState) -> Tuple[Future, Future]:
+        # Reading the CSV and analyzing the PDF are independent, so they run
+        # concurrently while the rest of the prompt is assembled
+        csv_future = pool.submit(pd.read_csv, state.sample_csv_path)
+        pdf_future = pool.submit(
+            PDFAnalyzer().analyze_pdf, state.sample_pdf_path)
+        return csv_future, pdf_future
+
+    def _build_pdf_context(self, state: AgentState, csv_future: Future,
+                           pdf_future: Future) -> str:
         try:
-            expected_df = pd.read_csv(state.sample_csv_path)
+            expected_df = csv_future.result()
             expected_columns = list(expected_df.columns)
             sample_data = expected_df.head(3).to_string()
         except Exception:
@@ -128,16 +338,7 @@ class ParserGenerator:
                                 "Debit", "Credit", "Balance"]
             sample_data = "Unable to load CSV sample"
 
-        pdf_analyzer = PDFAnalyzer()
-        pdf_analysis = pdf_analyzer.analyze_pdf(state.sample_pdf_path)
-
-        iteration_context = ""
-        if state.iteration_count > 0 and state.error_feedback:
-            iteration_context = f"""
-PREVIOUS ATTEMPT FAILED. Error feedback:
-{state.error_feedback}
-Please fix the issues mentioned above and try a different approach.
-"""
+        pdf_analysis = pdf_future.result()
 
         pdf_context = ""
         if "page_samples" in pdf_analysis:
@@ -147,30 +348,29 @@ PDF Analysis:
 - Pages: {pdf_analysis.get('num_pages', 'unknown')}
 - Sample text from first page:
 {sample_text[:800]}
-Tables found: {len(pdf_analysis.get('tables_found', []))}
+Tables found: {pdf_analysis.get('tables_found', 0)}
 """
 
-        prompt = f"""You are a Python coding expert. Generate a complete, working PDF parser for {state.target_bank.upper()} bank statements.
-{iteration_context}
-REQUIREMENTS:
-1. Function signature: parse(pdf_path: str) -> pd.DataFrame
-2. Return DataFrame with exactly these columns: {expected_columns}
-3. Handle errors gracefully with try/except
-4. Use pdfplumber as primary library (import pdfplumber)
-5. Include type hints and docstrings
-6. Extract transaction data from the PDF including Debit and Credit columns
+        return f"""Generate a complete, working PDF parser for {state.target_bank.upper()} bank statements.
+Return DataFrame with exactly these columns: {expected_columns}
 {pdf_context}
 Expected CSV structure:
 {sample_data}
-CRITICAL: The returned DataFrame MUST match the expected CSV schema exactly.
-Use pd.DataFrame.equals() for comparison in tests.
-Generate ONLY the Python code for the parser file. Include all necessary imports.
-Start with imports, then define the parse function.
-Generate the complete working code now:"""
+"""
 
-        generated_code = self.llm.generate(prompt)
-        code = self._extract_python_code(generated_code)
-        return code
+    def _build_dynamic_tail(self, state: AgentState) -> str:
+        iteration_context = ""
+        if state.iteration_count > 0 and state.error_feedback:
+            iteration_context = f"""
+PREVIOUS ATTEMPT FAILED. Error feedback:
+{state.error_feedback}
+Please fix the issues mentioned above and try a different approach.
+"""
+        return iteration_context
+
+    def _extract_parser_blocks(self, response: str) -> List[Tuple[str, str]]:
+        return re.findall(r'<parser bank="([^"]+)">(.*?)</parser>',
+                          response, re.DOTALL)
 
     def _extract_python_code(self, response: str) -> str:
         lines = response.split('\n')
@@ -188,6 +388,9 @@ Generate the complete working code now:"""
 
 
 class TestRunner:
+    def __init__(self):
+        self._test_files: Dict[str, Path] = {}
+
     def run_parser_test(self, state: AgentState) -> tuple[bool, str]:
         parser_dir = Path("custom_parsers")
         parser_dir.mkdir(exist_ok=True)
@@ -199,33 +402,43 @@ class TestRunner:
         except Exception as e:
             return False, f"Failed to write parser file: {e}"
 
-        test_content = self._create_test_content(state)
-        test_file = Path("test_parser.py")
-
         try:
-            with open(test_file, 'w') as f:
-                f.write(test_content)
+            test_file = self._get_test_file(state)
         except Exception as e:
             return False, f"Failed to write test file: {e}"
 
+        # Run pytest in-process to skip interpreter startup on every iteration.
+        # Drop the previously imported parser so the new code is picked up.
+        sys.modules.pop(f"{state.target_bank.lower()}_parser", None)
+        output_buffer = io.StringIO()
         try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pytest",
-                    str(test_file), "-v", "--tb=short"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=Path.cwd()
-            )
-            output = result.stdout + result.stderr
-            success = result.returncode == 0
-            test_file.unlink(missing_ok=True)
-            return success, output
-        except subprocess.TimeoutExpired:
-            return False, "Test execution timed out"
+            import pytest
+            with contextlib.redirect_stdout(output_buffer), \
+                    contextlib.redirect_stderr(output_buffer):
+                exit_code = pytest.main(
+                    [str(test_file), "-v", "--tb=short"])
+            success = exit_code == pytest.ExitCode.OK
+            return success, output_buffer.getvalue()
         except Exception as e:
             return False, f"Test execution failed: {e}"
 
+    def cleanup(self):
+        for test_file in self._test_files.values():
+            test_file.unlink(missing_ok=True)
+        self._test_files.clear()
+
+    def _get_test_file(self, state: AgentState) -> Path:
+        # The test only depends on the bank and its sample paths, so it is
+        # written once and reused by every iteration
+        bank = state.target_bank.lower()
+        if bank not in self._test_files:
+            # pytest keeps imported test modules in-process, so each bank needs its own
+            test_file = Path(f"test_{bank}_parser.py")
+            with open(test_file, 'w') as f:
+                f.write(self._create_test_content(state))
+            self._test_files[bank] = test_file
+        return self._test_files[bank]
+
     def _create_test_content(self, state: AgentState) -> str:
         return f"""
 import pytest
@@ -286,50 +499,271 @@ TEST OUTPUT:
 
 Please provide actionable steps to fix the parser code so it passes the tests.
 """
-        return self.llm.generate(prompt)
+        # Test output carries run timings, so these prompts never repeat
+        return self.llm.generate(prompt, cache=False)
+
+# Parser Cache
+
+
+class ParserCache:
+    def __init__(self, parser_dir: Path = Path("custom_parsers")):
+        self.parser_dir = parser_dir
+
+    def parser_path(self, state: AgentState) -> Path:
+        return self.parser_dir / f"{state.target_bank.lower()}_parser.py"
+
+    def marker_path(self, state: AgentState) -> Path:
+        return self.parser_dir / f".{state.target_bank.lower()}.parser_ready"
+
+    def can_reuse(self, state: AgentState) -> bool:
+        """An existing parser is worth testing unless its marker shows it was
+        built against different sample files."""
+        if not self.parser_path(state).exists():
+            return False
+        try:
+            with open(self.marker_path(state)) as f:
+                marker = json.load(f)
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError):
+            return False
+        return marker == self._fingerprint(state)
+
+    def schema_path(self, state: AgentState) -> Path:
+        return self.parser_dir / f"{state.target_bank.lower()}.schema.json"
+
+    def load_schema(self, state: AgentState) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.schema_path(state)) as f:
+                schema = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # A schema inferred from a different sample CSV no longer describes it
+        csv_digest = self._file_digest(state.sample_csv_path)
+        if not csv_digest or schema.get("csv_digest") != csv_digest:
+            return None
+        return schema
+
+    def save_schema(self, state: AgentState, schema: Optional[Dict[str, Any]]):
+        if schema is None:
+            return
+        schema = dict(schema, csv_digest=self._file_digest(state.sample_csv_path))
+        try:
+            with open(self.schema_path(state), 'w') as f:
+                json.dump(schema, f, indent=2)
+        except OSError as e:
+            print(f"Failed to write parser schema: {e}")
+
+    def load_parser(self, state: AgentState) -> str:
+        with open(self.parser_path(state)) as f:
+            return f.read()
+
+    def mark_ready(self, state: AgentState):
+        try:
+            with open(self.marker_path(state), 'w') as f:
+                json.dump(self._fingerprint(state), f)
+        except OSError as e:
+            print(f"Failed to write parser marker: {e}")
+
+    def _fingerprint(self, state: AgentState) -> Dict[str, str]:
+        return {
+            "pdf": self._file_digest(state.sample_pdf_path),
+            "csv": self._file_digest(state.sample_csv_path),
+        }
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            return ""
+        return digest.hexdigest()
+
+# Parser Template
+
+DATE_PATTERNS = [
+    r"\d{2}/\d{2}/\d{4}",
+    r"\d{2}-\d{2}-\d{4}",
+    r"\d{4}-\d{2}-\d{2}",
+    r"\d{2}-[A-Za-z]{3}-\d{4}",
+    r"\d{2} [A-Za-z]{3} \d{4}",
+]
+
+
+class ParserTemplate:
+    def __init__(self, template_path: Path = Path("custom_parsers") / "_template.py.tmpl"):
+        self.template_path = template_path
+
+    def infer_schema(self, csv_path: str) -> Optional[Dict[str, Any]]:
+        """Derives the fixed shape of a statement from its expected CSV.
+
+        Returns None when no column looks like a transaction date, since the
+        template relies on one to tell transaction rows from everything else.
+        """
+        try:
+            expected_df = pd.read_csv(csv_path)
+        except Exception:
+            return None
+
+        columns = list(expected_df.columns)
+        num_cols = [col for col in columns
+                    if pd.api.types.is_numeric_dtype(expected_df[col])]
+        # A numeric column without NaN stores blanks as 0 (e.g. ICICI's
+        # withdrawal/deposit columns); otherwise blanks stay NaN (None)
+        blank_values = {col: None if expected_df[col].isna().any() else 0.0
+                        for col in num_cols}
+        for date_col, col in enumerate(columns):
+            values = expected_df[col].dropna().astype(str)
+            if col in num_cols or values.empty:
+                continue
+            for pattern in DATE_PATTERNS:
+                if values.str.fullmatch(pattern).all():
+                    return {
+                        "columns": columns,
+                        "num_cols": num_cols,
+                        "blank_values": blank_values,
+                        "date_col": date_col,
+                        "date_regex": pattern,
+                        "min_row_len": len(columns),
+                    }
+        return None
+
+    def render(self, schema: Dict[str, Any], bank: str) -> str:
+        with open(self.template_path) as f:
+            template = string.Template(f.read())
+        return template.substitute(
+            bank=bank.lower(),
+            bank_upper=bank.upper(),
+            columns=repr(schema["columns"]),
+            num_cols=repr(schema["num_cols"]),
+            date_col=repr(schema["date_col"]),
+            date_regex=repr(schema["date_regex"]),
+            min_row_len=repr(schema["min_row_len"]),
+            blank_values=repr(schema.get("blank_values", {})),
+        )
 
 # Main
 
 
+def try_cached_parser(state: AgentState, parser_cache: ParserCache,
+                      parser_template: ParserTemplate, test_runner: TestRunner) -> bool:
+    """Tries to get a working parser for one bank without calling the LLM."""
+    bank = state.target_bank.upper()
+
+    # A parser that already passes against the current samples needs no LLM calls
+    if parser_cache.can_reuse(state):
+        print(f"\n=== Testing Existing {bank} Parser ===")
+        state.generated_code = parser_cache.load_parser(state)
+        success, output = test_runner.run_parser_test(state)
+        state.test_results = output
+        if success:
+            print(f"\n Existing {bank} Parser Passed All Tests")
+            state.parser_ready = True
+            parser_cache.mark_ready(state)
+            return True
+        print(f"\n Existing {bank} Parser Failed, Generating A New One")
+
+    # Once a bank's schema is known, a parser can be rendered without the LLM
+    schema = parser_cache.load_schema(state)
+    if schema is not None:
+        print(f"\n=== Rendering {bank} Parser From Saved Schema ===")
+        try:
+            state.generated_code = parser_template.render(
+                schema, state.target_bank)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Failed to render parser template: {e}")
+        else:
+            success, output = test_runner.run_parser_test(state)
+            state.test_results = output
+            if success:
+                print(f"\n Template {bank} Parser Passed All Tests")
+                state.parser_ready = True
+                parser_cache.mark_ready(state)
+                return True
+            print(f"\n Template {bank} Parser Failed, Falling Back To The LLM")
+
+    return False
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Bank Statement Parser Generator")
     parser.add_argument("--target", required=True,
-                        help="Target bank name (e.g. icici)")
+                        help="Target bank name, or comma-separated names (e.g. icici,sbi)")
     parser.add_argument("--pdf", required=True,
-                        help="Path to sample PDF statement")
+                        help="Path to sample PDF statement, comma-separated per target")
     parser.add_argument("--csv", required=True,
-                        help="Path to sample CSV with expected output")
+                        help="Path to sample CSV with expected output, comma-separated per target")
     parser.add_argument("--provider", default="gemini",
                         choices=["gemini", "groq"], help="LLM provider to use")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the LLM instead of reusing cached responses")
     args = parser.parse_args()
 
-    state = AgentState(target_bank=args.target,
-                       sample_pdf_path=args.pdf, sample_csv_path=args.csv)
-    llm_client = LLMClient(provider=args.provider)
-    parser_generator = ParserGenerator(llm_client)
-    test_runner = TestRunner()
-    feedback_analyzer = FeedbackAnalyzer(llm_client)
+    targets = [t.strip() for t in args.target.split(",")]
+    pdf_paths = [p.strip() for p in args.pdf.split(",")]
+    csv_paths = [p.strip() for p in args.csv.split(",")]
+    if not len(targets) == len(pdf_paths) == len(csv_paths):
+        parser.error("--target, --pdf and --csv need the same number of entries")
 
-    while state.iteration_count < state.max_iterations and not state.parser_ready:
-        print(f"\n=== Iteration {state.iteration_count+1} ===")
-        state.generated_code = parser_generator.generate_parser(state)
-        success, output = test_runner.run_parser_test(state)
-        state.test_results = output
+    states = [AgentState(target_bank=target, sample_pdf_path=pdf_path,
+                         sample_csv_path=csv_path)
+              for target, pdf_path, csv_path in zip(targets, pdf_paths, csv_paths)]
+    test_runner = TestRunner()
+    parser_cache = ParserCache()
+    parser_template = ParserTemplate()
 
-        if success:
-            print("\n Parser Passed All Tests")
-            state.parser_ready = True
-            break
-        else:
-            print("\n Test failed Analyzing Feedback")
-            state.error_feedback = feedback_analyzer.analyze_failure(
-                state, output)
-            print(state.error_feedback)
-            state.iteration_count += 1
-
-    if not state.parser_ready:
-        print("\n Could Not Generate A Working Parser After Max Iterations")
+    # Generated test files are reused across iterations and removed at the end
+    try:
+        for state in states:
+            try_cached_parser(state, parser_cache, parser_template, test_runner)
+
+        pending = [state for state in states if not state.parser_ready]
+        if not pending:
+            return
+
+        llm_client = LLMClient(provider=args.provider,
+                               use_cache=not args.no_cache)
+        parser_generator = ParserGenerator(llm_client)
+        feedback_analyzer = FeedbackAnalyzer(llm_client)
+
+        while pending:
+            print(f"\n=== Iteration {pending[0].iteration_count+1} ===")
+            generated = parser_generator.generate_parsers(pending)
+
+            for state in pending:
+                bank = state.target_bank.lower()
+                state.generated_code = generated.get(bank, "")
+                success, output = test_runner.run_parser_test(state)
+                state.test_results = output
+
+                if success:
+                    print(f"\n {bank.upper()} Parser Passed All Tests")
+                    state.parser_ready = True
+                    parser_cache.mark_ready(state)
+                    parser_cache.save_schema(
+                        state, parser_template.infer_schema(state.sample_csv_path))
+                else:
+                    print(f"\n {bank.upper()} Test failed Analyzing Feedback")
+                    parser_generator.discard_generation(state)
+                    state.error_feedback = feedback_analyzer.analyze_failure(
+                        state, output)
+                    print(state.error_feedback)
+                    state.iteration_count += 1
+
+            pending = [state for state in pending
+                       if not state.parser_ready
+                       and state.iteration_count < state.max_iterations]
+
+        for state in states:
+            if not state.parser_ready:
+                print(f"\n Could Not Generate A Working {state.target_bank.upper()} "
+                      "Parser After Max Iterations")
+    finally:
+        test_runner.cleanup()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,105 @@
+import numpy as np
 import pandas as pd
 import pdfplumber
 import re
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+_HEADER_KEYS = ('S No.', 'Value Date', 'Transaction Date')
+# Below this many pages, starting worker processes costs more than it saves
+_PARALLEL_MIN_PAGES = 8
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+_MAX_WORKERS = 61
+# Statement tables are ruled on every page. These are pdfplumber's default
+# strategies, spelled out so every page uses the same settings even if the
+# library defaults change.
+_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+}
+# Characters that commonly wrap amounts; stripped with str.translate (C-level)
+_NUM_STRIP_TABLE = str.maketrans('', '', ',\u20b9 \t\r\n')
+# Slow path for cells carrying anything else (e.g. "Cr"/"Dr" suffixes)
+_NUM_STRIP = re.compile(r"[^\d.-]")
+_NUM_CHARS = "0123456789.-"
+
+
+_DATE_DIGIT_POS = [0, 1, 3, 4, 6, 7, 8, 9]
+_DATE_SLASH_POS = [2, 5]
+
+
+def _date_mask(dates: list) -> np.ndarray:
+    """Vectorized dd/mm/yyyy prefix check over a column of cell strings."""
+    # A fixed-width U10 array truncates longer cells and zero-pads shorter
+    # ones, so each string becomes one row of 10 code points
+    codes = np.array(dates, dtype='U10').view(np.uint32).reshape(-1, 10)
+    digits = codes[:, _DATE_DIGIT_POS]
+    return (((digits >= ord('0')) & (digits <= ord('9'))).all(axis=1)
+            & (codes[:, _DATE_SLASH_POS] == ord('/')).all(axis=1))
+
+
+def _to_float(s: str) -> float:
+    """Parses an amount cell, treating blank or unparseable cells as 0."""
+    stripped = s.translate(_NUM_STRIP_TABLE)
+    # float() also accepts "nan", "inf", "1e3" and "1_000"; anything beyond
+    # digits, '.' and '-' goes through the regex strip like the baseline did
+    if stripped.strip(_NUM_CHARS):
+        stripped = _NUM_STRIP.sub("", s)
+    try:
+        return float(stripped or 0)
+    except ValueError:
+        return 0.0
+
+
+def _page_rows(page) -> list:
+    """
+    Extracts the transaction rows from a single page of the statement.
+
+    Args:
+        page: A pdfplumber page of the ICICI bank statement.
+
+    Returns:
+        A list of transaction rows: the first five cells as stripped strings
+        followed by the withdrawal, deposit and balance amounts as floats.
+    """
+    candidates = []
+    tables = page.extract_tables(table_settings=_TABLE_SETTINGS)
+    if not tables:
+        return candidates
+    for table in tables:
+        for row in table:
+
+            row = [str(x).strip() if x else "" for x in row]
+
+            # str.startswith takes the whole tuple in a single C call
+            if len(row) < 8 or row[0].startswith(_HEADER_KEYS):
+                continue
+
+            candidates.append(row)
+
+    if not candidates:
+        return candidates
+    # Date check runs once over the whole page instead of per row
+    keep = _date_mask([row[1] for row in candidates])
+    # Amounts are parsed while the kept rows are assembled, so no separate
+    # cleanup pass over the DataFrame is needed
+    return [row[:5] + [_to_float(row[5]), _to_float(row[6]), _to_float(row[7])]
+            for row in itertools.compress(candidates, keep)]
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> list:
+    """
+    Extracts the transaction rows from pages [start, stop) of the statement.
+
+    Runs in a worker process, so it opens its own handle to the PDF, once
+    for its whole range of pages.
+    """
+    rows = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            rows.extend(_page_rows(page))
+    return rows
 
 
 def parse(pdf_path: str) -> pd.DataFrame:
@@ -15,47 +114,58 @@ def parse(pdf_path: str) -> pd.DataFrame:
         'Transaction Remarks', 'Withdrawal Amount (INR)', 'Deposit Amount (INR)', 'Balance (INR)']
     """
     try:
-        transactions = []
+        # Table extraction is CPU-bound, so longer statements are extracted in
+        # parallel processes; short ones reuse the handle opened here
+        rows = []
         with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                if not tables:
-                    continue
-                for table in tables:
-                    for row in table:
-
-                        row = [str(x).strip() if x else "" for x in row]
-
-                        header_keys = [
-                            'S No.', 'Value Date', 'Transaction Date']
-                        if any(hk in row[0] for hk in header_keys) or len(row) < 8:
-                            continue
+            num_pages = len(pdf.pages)
+            workers = min(num_pages, os.cpu_count() or 1, _MAX_WORKERS)
+            parallel = num_pages >= _PARALLEL_MIN_PAGES and workers > 1
+            if not parallel:
+                for page in pdf.pages:
+                    rows.extend(_page_rows(page))
 
-                        if not re.match(r"\d{2}/\d{2}/\d{4}", row[1]):
-                            continue
+        if parallel:
+            # One contiguous chunk of pages per worker, so each worker opens
+            # the PDF only once
+            step = -(-num_pages // workers)
+            starts = range(0, num_pages, step)
+            stops = [min(start + step, num_pages) for start in starts]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk_rows in executor.map(_extract_page_range,
+                                               itertools.repeat(pdf_path),
+                                               starts, stops):
+                    rows.extend(chunk_rows)
 
-                        transactions.append(row)
+        # Accumulate column-wise so pandas can ingest the columns without a transpose
+        s_no, val_date, txn_date, cheque, remarks, wd, dep, bal = (
+            [], [], [], [], [], [], [], [])
+        for row in rows:
+            s_no.append(row[0])
+            val_date.append(row[1])
+            txn_date.append(row[2])
+            cheque.append(row[3])
+            remarks.append(row[4])
+            wd.append(row[5])
+            dep.append(row[6])
+            bal.append(row[7])
 
-        if not transactions:
+        if not s_no:
             print(" No transactions extracted!")
             columns = ['S No.', 'Value Date', 'Transaction Date', 'Cheque Number',
                        'Transaction Remarks', 'Withdrawal Amount (INR)', 'Deposit Amount (INR)', 'Balance (INR)']
             return pd.DataFrame(columns=columns)
 
-        columns = ['S No.', 'Value Date', 'Transaction Date', 'Cheque Number',
-                   'Transaction Remarks', 'Withdrawal Amount (INR)', 'Deposit Amount (INR)', 'Balance (INR)']
-        df = pd.DataFrame(transactions, columns=columns)
-
-        # Numeric convert to float
-        num_cols = ['Withdrawal Amount (INR)',
-                    'Deposit Amount (INR)', 'Balance (INR)']
-        for col in num_cols:
-            df[col] = (df[col]
-                       # Remove commas & symbols
-                       .replace(r"[^\d.-]", "", regex=True)
-                       .replace("", "0")
-                       )
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        df = pd.DataFrame({
+            'S No.': s_no,
+            'Value Date': val_date,
+            'Transaction Date': txn_date,
+            'Cheque Number': cheque,
+            'Transaction Remarks': remarks,
+            'Withdrawal Amount (INR)': wd,
+            'Deposit Amount (INR)': dep,
+            'Balance (INR)': bal,
+        })
 
         return df
 